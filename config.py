@@ -1,24 +1,36 @@
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 def load_config():
     """Load and validate configuration from environment variables"""
 
     # Use default location IDs if none provided
     default_locations = '14321'  # Charlotte-Douglas International Airport - 5501 Josh Birmingham Parkway Charlotte NC 28208
-    location_ids = os.getenv('LOCATION_IDS', default_locations)
 
+    location_ids, check_interval, ntfy_topic = _parse_env(
+        os.getenv('LOCATION_IDS', default_locations),
+        os.getenv('CHECK_INTERVAL', '900'),  # 15 minutes default
+        os.getenv('NTFY_TOPIC', 'vu_alert')
+    )
+
+    # The date window moves with the calendar, so it is worked out on every call
     now = datetime.now()
-    config = {
-        'LOCATION_IDS': [str(loc_id).strip() for loc_id in location_ids.split(',')],  # Ensure proper string formatting
+    return {
+        'LOCATION_IDS': list(location_ids),
         'DATE_START': now.strftime('%Y-%m-%d'),  # Just the date portion for API
         'DATE_END': (now + timedelta(days=365)).strftime('%Y-%m-%d'),  # Just the date portion for API
-        'CHECK_INTERVAL': int(os.getenv('CHECK_INTERVAL', '900')),  # 15 minutes default
-        'NTFY_TOPIC': os.getenv('NTFY_TOPIC', 'vu_alert')
+        'CHECK_INTERVAL': check_interval,
+        'NTFY_TOPIC': ntfy_topic
     }
 
+@lru_cache(maxsize=1)
+def _parse_env(location_ids, check_interval, ntfy_topic):
+    """Parse and validate the raw environment values, cached so repeat calls reuse them; returns immutable values"""
+    parsed_location_ids = tuple(str(loc_id).strip() for loc_id in location_ids.split(','))  # Ensure proper string formatting
+
     # Validate required configuration
-    if not config['LOCATION_IDS']:
+    if not parsed_location_ids:
         raise ValueError("LOCATION_IDS environment variable is empty or invalid")
 
-    return config
\ No newline at end of file
+    return parsed_location_ids, int(check_interval), ntfy_topic
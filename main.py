@@ -1,9 +1,6 @@
-import os
-import time
+import asyncio
 import logging
 import argparse
-import pytz
-from datetime import datetime
 from config import load_config
 from slot_checker import GlobalEntrySlotChecker
 from notifier import Notifier
@@ -13,7 +10,7 @@ def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Global Entry Appointment Slot Checker')
     parser.add_argument('-l', '--location', required=True,
-                        help='Location ID to check for appointments')
+                        help='Location ID(s) to check for appointments (comma-separated)')
     parser.add_argument('-n', '--notifier', required=True,
                         choices=['ntfy'],
                         help='Notification service to use (currently only ntfy supported)')
@@ -21,9 +18,11 @@ def parse_args():
                         help='ntfy.sh topic for notifications (default: vu_alert)')
     parser.add_argument('-i', '--interval', type=int, default=300,
                         help='Time between checks in seconds (default: 300)')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='Request all locations in a single API call (falls back to one call per location)')
     return parser.parse_args()
 
-def main():
+async def main():
     # Setup logging
     setup_logging()
     logger = logging.getLogger(__name__)
@@ -33,10 +32,11 @@ def main():
         args = parse_args()
 
         # Update config with command line arguments
+        env_config = load_config()
         config = {
-            'LOCATION_IDS': [args.location],
-            'DATE_START': load_config()['DATE_START'],
-            'DATE_END': load_config()['DATE_END'],
+            'LOCATION_IDS': [loc_id.strip() for loc_id in args.location.split(',')],
+            'DATE_START': env_config['DATE_START'],
+            'DATE_END': env_config['DATE_END'],
             'CHECK_INTERVAL': args.interval,
             'NTFY_TOPIC': args.topic
         }
@@ -45,13 +45,16 @@ def main():
         slot_checker = GlobalEntrySlotChecker(
             location_ids=config['LOCATION_IDS'],
             date_start=config['DATE_START'],
-            date_end=config['DATE_END']
+            date_end=config['DATE_END'],
+            batch_locations=args.batch
         )
 
         notifier = Notifier(ntfy_topic=config['NTFY_TOPIC'])
 
+        location_names = ', '.join(slot_checker.location_name(loc_id) for loc_id in config['LOCATION_IDS'])
+
         logger.info("Global Entry Slot Notifier started")
-        logger.info(f"Checking location ID: {args.location}")
+        logger.info(f"Checking location IDs: {', '.join(config['LOCATION_IDS'])}")
         logger.info(f"Using notifier: {args.notifier}")
         logger.info(f"Check interval: {args.interval} seconds")
 
@@ -65,46 +68,44 @@ def main():
                 f"Current Time: {slot['time']}\n"  # This will now show in EST
                 f"Monitoring for available appointments..."
             )
-            success = notifier.send_notification(message)
+            success = await asyncio.to_thread(notifier.send_notification, message)
             logger.info(f"Test notification {'sent successfully' if success else 'failed'}")
 
-        while True:
-            try:
-                # Check for available slots
-                available_slots = slot_checker.check_slots()
-
-                if available_slots:
-                    # Create message with only the nearest available slots
-                    slot = available_slots[0]  # We only have one slot now (earliest date)
-                    message = (
-                        f"🎉 Global Entry Slots Available!\n\n"
-                        f"Location: {slot['location_name']}\n"
+        async def report(available_slots, poll_interval):
+            """Send the notification for one round of checks"""
+            if available_slots:
+                # Combine every location's earliest slots into a single notification
+                parts = ["🎉 Global Entry Slots Available!"]
+                for slot in available_slots:
+                    parts.append(
+                        f"\n\nLocation: {slot['location_name']}\n"
                         f"Date: {slot['date']}\n"
                         f"Available times (EST):\n"
                     )
-                    times_str = '\n'.join([f"- {time}" for time in slot['times']])
-                    message += times_str
-
-                    # Send notification
-                    success = notifier.send_notification(message, title="Global Entry Slot Available")
-                else:
-                    # Send notification for no available slots
-                    message = (
-                        f"No appointments currently available at {config['LOCATION_IDS'][0]}\n"
-                        f"Will check again in {config['CHECK_INTERVAL']} seconds."
-                    )
-                    success = notifier.send_notification(message, title="No Slot Available")
+                    parts.append('\n'.join([f"- {time}" for time in slot['times']]))
+                all_slots_message = ''.join(parts)
 
-                # Wait before next check
-                time.sleep(config['CHECK_INTERVAL'])
+                # Send notification
+                await asyncio.to_thread(
+                    notifier.send_notification, all_slots_message, title="Global Entry Slot Available"
+                )
+            else:
+                # Send notification for no available slots
+                message = (
+                    f"No appointments currently available at {location_names}\n"
+                    f"Will check again in {poll_interval} seconds."
+                )
+                await asyncio.to_thread(
+                    notifier.send_notification, message, title="No Slot Available"
+                )
 
-            except Exception as e:
-                logger.error(f"Error during slot check: {str(e)}")
-                time.sleep(60)  # Wait a minute before retrying
+        # Each checker polls in its own task; further checkers can join the same group
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(slot_checker.run_forever(config['CHECK_INTERVAL'], report))
 
     except Exception as e:
         logger.critical(f"Critical error: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,10 +1,15 @@
 import requests
 import logging
+from requests.adapters import HTTPAdapter
 
 class Notifier:
     def __init__(self, ntfy_topic='vu_alert'):
         self.ntfy_topic = ntfy_topic
         self.logger = logging.getLogger(__name__)
+
+        # Reuse one keep-alive connection pool to ntfy.sh instead of a new TLS handshake per message
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
         self.logger.info(f"Notifier initialized with ntfy topic: {ntfy_topic}")
 
     def send_notification(self, message, title='Global Entry Alert'):
@@ -17,8 +22,8 @@ class Notifier:
                 'Priority': 'urgent',
                 'Tags': 'calendar'
             }
-            self.logger.debug(f"Sending message: {message}")
-            response = requests.post(url, data=message, headers=headers)
+            self.logger.debug("Sending message: %s", message)
+            response = self.session.post(url, data=message, headers=headers, timeout=10)
             self.logger.info(f"Notification response status: {response.status_code}")
 
             if response.status_code == 200:
@@ -1,55 +1,228 @@
 import requests
+import asyncio
+import json
 import logging
-from datetime import datetime
+import random
+import threading
 import time
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import pytz
+from zoneinfo import ZoneInfo
+from utils import TokenBucket
+
+try:
+    import orjson
+except ImportError:
+    # Stdlib json offers the same loads(bytes) / JSONDecodeError surface, just slower
+    orjson = json
+
+# Returned by _fetch_slots when the server answers 304 Not Modified
+_NOT_MODIFIED = object()
+
+# Returned by _fetch_slots for throttling and other failures that say nothing about the request itself
+_TRANSIENT = object()
+
+# Process-wide session, built on first use by _shared_session()
+_session = None
+_session_lock = threading.Lock()
+_POOL_MAXSIZE = 16  # pooled connections; covers a couple of checkers' worker threads
+
+# Retry policy for scheduler requests. Retry is immutable (urllib3 copies it per request),
+# so one instance is built at import time and shared
+_RETRY = Retry(
+    total=3,  # number of retries
+    backoff_factor=1,  # wait 1, 2, 4 seconds between retries
+    status_forcelist=(429, 500, 502, 503, 504),  # retry on these status codes
+    raise_on_status=False,  # hand back the final response so throttling can be backed off
+)
+
+# Headers common to every request, set once as session defaults. Only gzip/deflate are offered:
+# urllib3 can't decode brotli ('br') bodies unless the optional brotli package is installed
+_SESSION_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
+def _build_session():
+    """Build a requests session with retries and a keep-alive connection pool"""
+    session = requests.Session()
+    session.headers.update(_SESSION_HEADERS)
+    # Keep one pooled keep-alive connection per worker thread so repeat cycles reuse TLS sessions
+    adapter = HTTPAdapter(
+        max_retries=_RETRY,
+        pool_connections=1,  # every request goes to ttp.cbp.dhs.gov
+        pool_maxsize=_POOL_MAXSIZE
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _shared_session():
+    """Return the process-wide session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+# Resolve the display timezone once; every Appointment shares the same tzinfo object
+_EST_TZ = ZoneInfo('America/New_York')
+
+def _parse_timestamp(timestamp):
+    """Parse an API timestamp in the fixed 'YYYY-MM-DDTHH:MM' format"""
+    if len(timestamp) == 16 and timestamp[10] == 'T':
+        # fromisoformat is implemented in C and far cheaper than strptime's format interpreter
+        return datetime.fromisoformat(timestamp)
+    # Anything else goes through strptime so malformed input fails exactly as before
+    return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M')
+
+def _eastern_midnight_utc(date, days_after=0):
+    """UTC 'YYYY-MM-DDTHH:MM' instant of Eastern midnight starting `date` ('YYYY-MM-DD') plus days_after days"""
+    midnight = datetime.fromisoformat(date).replace(tzinfo=_EST_TZ) + timedelta(days=days_after)
+    return midnight.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M')
+
+def _format_slot(start_timestamp):
+    """Convert a UTC API timestamp to Eastern display strings: ('YYYY-MM-DD', 'HH:MM AM/PM EST')"""
+    est_time = _parse_timestamp(start_timestamp).replace(tzinfo=timezone.utc).astimezone(_EST_TZ)
+    # Format directly from the fields; strftime is several times slower for these fixed layouts
+    hour = est_time.hour
+    return (
+        est_time.date().isoformat(),
+        f"{hour % 12 or 12:02d}:{est_time.minute:02d} {'AM' if hour < 12 else 'PM'} EST"  # 12-hour format with AM/PM and EST indicator
+    )
 
 class Appointment:
     """Represents a Global Entry appointment slot"""
+    __slots__ = ('location_id', 'start_timestamp', 'end_timestamp', 'duration', 'date', 'time')
+    est_tz = _EST_TZ
+
     def __init__(self, location_id: str, start_timestamp: str, end_timestamp: str, duration: int = 15):
         self.location_id = location_id
         self.start_timestamp = start_timestamp
         self.end_timestamp = end_timestamp
         self.duration = duration
-        self.est_tz = pytz.timezone('America/New_York')
-
-    @property
-    def date(self):
-        utc_time = datetime.strptime(self.start_timestamp, '%Y-%m-%dT%H:%M')
-        est_time = pytz.UTC.localize(utc_time).astimezone(self.est_tz)
-        return est_time.strftime('%Y-%m-%d')
 
-    @property
-    def time(self):
-        utc_time = datetime.strptime(self.start_timestamp, '%Y-%m-%dT%H:%M')
-        est_time = pytz.UTC.localize(utc_time).astimezone(self.est_tz)
-        return est_time.strftime('%I:%M %p EST')  # 12-hour format with AM/PM and EST indicator
+        # Parse and convert the timestamp once; date/time are read several times per slot
+        self.date, self.time = _format_slot(start_timestamp)
 
 class GlobalEntrySlotChecker:
     BASE_URL = "https://ttp.cbp.dhs.gov/schedulerapi/slots"
-
-    def __init__(self, location_ids, date_start, date_end):
+    MAX_CONCURRENT_REQUESTS = 8  # upper bound on locations polled at the same time
+    RATE_LIMIT = (5, 10)  # at most 5 scheduler API requests per 10 seconds, bursts allowed
+    REFRESH_TTL = 600  # seconds a refreshed session is reused before visiting the scheduling page again
+    COOKIE_EXPIRY_MARGIN = 30  # seconds before a session cookie expires that it stops being reused
+    MAX_RESPONSE_BYTES = 1_000_000  # slot lists are a few KB; anything far larger is rejected unread
+    MIN_BACKOFF, MAX_BACKOFF = 1.0, 60.0  # seconds a worker pauses after the server throttles us
+    UNCHANGED_STREAK_STEP = 4  # unchanged polls before the poll interval is stretched
+    MAX_INTERVAL_MULTIPLIER = 2  # cap on how far the poll interval is stretched
+    REJECTED_QUERY_STATUSES = (400, 404, 422)  # responses meaning the query's parameters were refused
+    POLL_JITTER = 2.0  # up to this many seconds added to each wait so checkers don't poll in lockstep
+    ERROR_RETRY_DELAY = 60  # seconds to wait after a failed check before trying again
+
+    # Request headers and location names never change, so they are built once at import time;
+    # the request headers are layered on top of the session defaults in _SESSION_HEADERS
+    _API_HEADERS = MappingProxyType({
+        'Accept': 'application/json, text/plain, */*',
+        'Referer': 'https://ttp.cbp.dhs.gov/schedulerui/schedule-interview/location?lang=en&vo=true&returnUrl=ttpui/home&service=up',
+        'Origin': 'https://ttp.cbp.dhs.gov'
+    })
+    _REFRESH_HEADERS = MappingProxyType({
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+        'Upgrade-Insecure-Requests': '1'
+    })
+
+    # Display names for known enrollment center location IDs
+    LOCATION_NAMES = MappingProxyType({
+        '5140': 'JFK International Airport',
+        '14321': 'Charlotte-Douglas International Airport',
+        '5142': 'Boston Logan Airport',
+        '5182': 'Daniel K. Inouye International Airport',
+        '5002': 'Los Angeles International Airport',
+        '5446': 'San Francisco International Airport',
+        '5177': 'Seattle-Tacoma International Airport',
+        '5013': 'Miami International Airport',
+        '5300': 'Minneapolis Saint Paul Airport',
+        '5447': 'Philadelphia International Airport',
+        '5027': 'Detroit International Airport',
+        '5499': 'Champlain-Highgate',
+        '5161': 'Alcan',
+        '13321': 'Chicago O\'Hare'
+    })
+
+    def __init__(self, location_ids, date_start, date_end, batch_locations=False, cache_ttl_seconds=0):
         self.location_ids = location_ids
         self.date_start = date_start
         self.date_end = date_end
+        # The window is in Eastern dates but the API timestamps are UTC, so turn its bounds into
+        # UTC 'YYYY-MM-DDTHH:MM' instants once; those sort like the timestamps themselves, letting
+        # slots be checked against the window by plain string comparison
+        self._start_key = _eastern_midnight_utc(date_start)
+        self._end_key = _eastern_midnight_utc(date_end, days_after=1)  # exclusive
         self.logger = logging.getLogger(__name__)
-        self.logger.debug(f"Initialized with date range: {date_start} to {date_end}")
+        self.logger.debug("Initialized with date range: %s to %s", date_start, date_end)
 
-        # Store last seen slots to prevent duplicate notifications
-        self.last_seen_slots = {}
+        # Query strings only depend on the location, so format each slots URL once up front
+        self._urls = {
+            location_id: f"{self.BASE_URL}?orderBy=soonest&locationId={location_id}&minimum=1"
+            for location_id in location_ids
+        }
+
+        # Optionally ask for every location in one request (repeated locationId parameters). The
+        # scheduler API does not document this, so it is opt-in and falls back to per-location requests
+        self._batch_url = None
+        if batch_locations and len(location_ids) > 1:
+            self._batch_url = f"{self.BASE_URL}?" + urlencode(
+                [('orderBy', 'soonest')] + [('locationId', location_id) for location_id in location_ids] + [('minimum', 1)]
+            )
 
-        # Configure session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,  # number of retries
-            backoff_factor=1,  # wait 1, 2, 4 seconds between retries
-            status_forcelist=[429, 500, 502, 503, 504],  # retry on these status codes
+        # Worker pool for polling locations concurrently, kept for the checker's lifetime so
+        # each cycle reuses the same threads (and their pooled connections)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.MAX_CONCURRENT_REQUESTS, len(location_ids))),  # an empty list is valid
+            thread_name_prefix='slot-check'
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+
+        # Shared across worker threads to keep polling polite without serializing requests
+        self._rate_limiter = TokenBucket(*self.RATE_LIMIT)
+
+        # Concurrent 403s should trigger a single session refresh, not one per worker
+        self._refresh_lock = threading.Lock()
+        self._session_generation = 0
+        self._last_refresh = None  # time.monotonic() of the last successful refresh
+        self._session_ttl = self.REFRESH_TTL  # seconds that refresh stays usable, see _session_lifetime()
+
+        # Cache validators (ETag / Last-Modified) per slots URL for conditional requests
+        self._validators = {}
+
+        # Decoded slot lists per URL with their fetch time, reused for cache_ttl_seconds. Off by default:
+        # the polling loop waits longer than any useful TTL between cycles, so only callers that
+        # check more often than that (e.g. several consumers of one checker) benefit from it
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._slot_cache = {}
+
+        # Adaptive pacing: backoff grows once per cycle in which the server throttled us and shrinks
+        # after cycles without throttling; unchanged polls per location stretch the caller's poll interval
+        self._backoff = 2.0
+        self._throttled_cycle = False  # set by any worker that was throttled during the current cycle
+        self._unchanged_streak = {location_id: 0 for location_id in location_ids}
+
+        # Fingerprints of the last seen slots per location, to prevent duplicate notifications
+        self.last_seen_slots = {}
+
+        # All checkers share one session so keep-alive connections survive checker lifetimes
+        self.session = _shared_session()
+
+    def location_name(self, location_id):
+        """Display name for a location ID, falling back to the raw ID for unknown locations"""
+        return self.LOCATION_NAMES.get(location_id, f'Location {location_id}')
 
     def _slots_changed(self, location_id: str, new_slots: list) -> bool:
         """
@@ -58,92 +231,280 @@ class GlobalEntrySlotChecker:
         """
         if not new_slots:
             # If no new slots and we didn't have any before, no change
-            return bool(self.last_seen_slots.get(location_id))
+            return location_id in self.last_seen_slots
 
-        # Get the first slot since we only care about the earliest date
+        # Only a fingerprint of the earliest date and its times is kept per location, so the
+        # comparison is a single int check and memory doesn't grow with the number of times
         new_slot = new_slots[0]
-        last_slot = self.last_seen_slots.get(location_id)
+        new_hash = hash((new_slot['date'], tuple(new_slot['times'])))
+        last_hash = self.last_seen_slots.get(location_id)
 
-        # If we have no last seen slots, or if the slots are different
-        if not last_slot:
-            self.last_seen_slots[location_id] = new_slot
-            return True
-
-        # Compare date and times
-        has_changed = (
-            new_slot['date'] != last_slot['date'] or 
-            new_slot['times'] != last_slot['times']
-        )
-
-        if has_changed:
-            self.last_seen_slots[location_id] = new_slot
-            self.logger.info(f"Slots changed for location {location_id}")
+        if last_hash == new_hash:
+            return False
 
-        return has_changed
+        if last_hash is not None:
+            self.logger.info("Slots changed for location %s", location_id)
+        self.last_seen_slots[location_id] = new_hash
+        return True
 
     def check_slots(self):
-        """Check for available appointment slots"""
+        """Check for available appointment slots across all locations concurrently"""
         available_slots = []
 
-        # First refresh the session before checking slots
-        if not self._refresh_session():
+        # Refresh the session first unless the last refresh is still fresh
+        if not self._session_is_fresh() and not self._refresh_session():
             self.logger.error("Failed to refresh session, cannot proceed with slot check")
             return []
 
-        for location_id in self.location_ids:
-            try:
-                self.logger.info(f"Checking slots for location {location_id}")
-                url = f"{self.BASE_URL}?orderBy=soonest&locationId={location_id}&minimum=1"
+        self._throttled_cycle = False
+        batch_slots = self._check_batch() if self._batch_url else None
+        if batch_slots is not None:
+            available_slots = batch_slots
+        else:
+            if self._batch_url:
+                self.logger.warning("Batched slot request failed, falling back to per-location requests")
+            # Fan the per-location requests out over the worker pool
+            for location_slots in self._executor.map(self._check_one, self.location_ids):
+                available_slots.extend(location_slots)
 
-                response = self._make_request(url)
-                if not response:
-                    continue
+        self._pace_after_cycle()
+        return available_slots
 
-                if response.status_code == 200:
-                    slots = response.json()
-                    self.logger.info(f"Found {len(slots)} slots for location {location_id}")
-                    processed_slots = self._process_slots(slots, location_id)
-
-                    # Only add slots to available_slots if they've changed
-                    if processed_slots and self._slots_changed(location_id, processed_slots):
-                        available_slots.extend(processed_slots)
-
-                elif response.status_code == 403:
-                    self.logger.warning("Session expired, refreshing...")
-                    if self._refresh_session():
-                        response = self._make_request(url)
-                        if response and response.status_code == 200:
-                            slots = response.json()
-                            self.logger.info(f"Found {len(slots)} slots for location {location_id}")
-                            processed_slots = self._process_slots(slots, location_id)
-                            if processed_slots and self._slots_changed(location_id, processed_slots):
-                                available_slots.extend(processed_slots)
-                else:
-                    self._handle_error_response(response, location_id)
-
-                # Add delay between requests to avoid rate limiting
-                time.sleep(2)
+    async def check_slots_async(self):
+        """Coroutine form of check_slots for asyncio callers; the blocking HTTP work runs in a worker thread"""
+        return await asyncio.to_thread(self.check_slots)
 
+    async def run_forever(self, interval_s, on_check):
+        """Poll until cancelled, awaiting on_check(available_slots, poll_interval) after every check"""
+        while True:
+            try:
+                available_slots = await self.check_slots_async()
+                poll_interval = self.next_poll_interval(interval_s)
+                await on_check(available_slots, poll_interval)
             except Exception as e:
-                self.logger.error(f"Error checking slots for location {location_id}: {str(e)}")
+                self.logger.error(f"Error during slot check: {str(e)}")
+                await asyncio.sleep(self.ERROR_RETRY_DELAY)
+                continue
 
-        return available_slots
+            # Wait before next check; the interval stretches while nothing changes
+            await asyncio.sleep(poll_interval + random.uniform(0, self.POLL_JITTER))
+
+    def _check_one(self, location_id):
+        """Check a single location, returning its slots only if they have changed"""
+        try:
+            self.logger.info("Checking slots for location %s", location_id)
+            slots = self._fetch_slots(self._urls[location_id], location_id)
+            if slots is _NOT_MODIFIED:
+                self._record_poll(location_id, changed=False)
+                return []
+            if slots is None or slots is _TRANSIENT:
+                return []
+            return self._changed_slots(slots, location_id)
+
+        except Exception as e:
+            self.logger.error(f"Error checking slots for location {location_id}: {str(e)}")
+
+        return []
+
+    def _check_batch(self):
+        """
+        Check every location with a single request, returning changed slots for all of them
+        Returns None if the batched query is refused or its response can't be attributed to locations,
+        so the caller can fall back; a throttled, blocking or failing server just skips the cycle
+        """
+        label = ', '.join(self.location_ids)
+        try:
+            self.logger.info("Checking slots for locations %s in one request", label)
+            slots = self._fetch_slots(self._batch_url, label)
+            if slots is _TRANSIENT:
+                # Fanning out now would only send more requests into the same failure
+                self.logger.warning("Batched slot request failed, skipping this cycle")
+                return []
+            if slots is None:
+                return None
+            if slots is _NOT_MODIFIED:
+                for location_id in self.location_ids:
+                    self._record_poll(location_id, changed=False)
+                return []
+
+            # The response is ordered soonest first across locations; split it back out per location
+            slots_by_location = {location_id: [] for location_id in self.location_ids}
+            for slot_data in slots:
+                location_slots = slots_by_location.get(str(slot_data.get('locationId')))
+                if location_slots is None:
+                    self.logger.warning(f"Batched response contained an unexpected slot: {slot_data}")
+                    return None
+                location_slots.append(slot_data)
+
+            available_slots = []
+            for location_id, location_slots in slots_by_location.items():
+                available_slots.extend(self._changed_slots(location_slots, location_id))
+            return available_slots
+
+        except Exception as e:
+            self.logger.error(f"Error checking slots for locations {label}: {str(e)}")
+            return None
+
+    def _fetch_slots(self, url, label):
+        """
+        Fetch and decode a slots URL, refreshing the session once on 403
+        Returns the decoded slot list, _NOT_MODIFIED on 304, None if the query itself was refused
+        (REJECTED_QUERY_STATUSES) or undecodable, and _TRANSIENT for any other failure such as
+        throttling, server errors or a 403 that outlasts the refresh (worth retrying next cycle)
+        """
+        cached = self._slot_cache.get(url)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl_seconds:
+            self.logger.debug("Using cached slots for location %s", label)
+            return cached[1]
+
+        # Note which session this request ran under, so a 403 only refreshes a stale one
+        generation = self._session_generation
+        response = self._make_request(url)
+        if response is None:
+            return _TRANSIENT
+
+        if response.status_code == 403 and 'Set-Cookie' in response.headers:
+            # The session already stored any cookies the 403 set; retrying with them is often
+            # enough, and then the scheduling page doesn't need visiting again
+            self.logger.warning("Session expired, retrying with renewed cookies...")
+            response = self._make_request(url)
+            if response is None:
+                return _TRANSIENT
+
+        if response.status_code == 403:
+            # No renewed cookies, or they weren't accepted: refresh and retry once more
+            self.logger.warning("Session expired, refreshing...")
+            if not self._refresh_expired_session(generation):
+                return _TRANSIENT
+            response = self._make_request(url)
+            if response is None:
+                return _TRANSIENT
+
+        if response.status_code != 200:
+            # Don't let an earlier good response outlive an error from the API
+            self._slot_cache.pop(url, None)
+
+        if response.status_code == 304:
+            # Server confirmed nothing changed since the last poll, so there is nothing to report
+            self.logger.info("Slots unchanged for location %s", label)
+            return _NOT_MODIFIED
+
+        if response.status_code in (429, 503):
+            self._throttled(label)
+            return _TRANSIENT
+
+        if response.status_code == 200:
+            slots = self._decode_slots(response, label)
+            if slots is not None:
+                self.logger.info("Found %d slots for location %s", len(slots), label)
+                self._store_validators(url, response)
+                if self.cache_ttl_seconds > 0:
+                    self._slot_cache[url] = (time.monotonic(), slots)
+            return slots
+
+        self._handle_error_response(response, label)
+        # Only these say anything about the URL; a 403 here, for one, means we're being blocked
+        return None if response.status_code in self.REJECTED_QUERY_STATUSES else _TRANSIENT
+
+    def _changed_slots(self, slots, location_id):
+        """Process a location's raw slots, returning them only if they differ from the last poll"""
+        processed_slots = self._process_slots(slots, location_id)
+        if processed_slots and self._slots_changed(location_id, processed_slots):
+            self._record_poll(location_id, changed=True)
+            return processed_slots
+        self._record_poll(location_id, changed=False)
+        return []
+
+    def _record_poll(self, location_id, changed):
+        """Track how many consecutive polls found nothing new for a location"""
+        self._unchanged_streak[location_id] = 0 if changed else self._unchanged_streak[location_id] + 1
+
+    def _throttled(self, label):
+        """Note a 429/503 that outlasted the adapter's retries; the cycle backs off once it finishes"""
+        self._throttled_cycle = True
+        self.logger.warning("Throttled while checking location %s", label)
+
+    def _pace_after_cycle(self):
+        """Adjust the backoff once per cycle: double it and pause if anything was throttled, otherwise ease off"""
+        if not self._throttled_cycle:
+            self._backoff = max(self.MIN_BACKOFF, self._backoff * 0.8)
+            return
+        self._backoff = min(self.MAX_BACKOFF, self._backoff * 2)
+        self.logger.warning(f"Throttled during this cycle, backing off {self._backoff:.0f} seconds")
+        time.sleep(self._backoff)
+
+    def next_poll_interval(self, base_interval):
+        """
+        Stretch base_interval while every location keeps returning unchanged slots
+        Doubles after UNCHANGED_STREAK_STEP quiet polls, capped at MAX_INTERVAL_MULTIPLIER
+        """
+        streak = min(self._unchanged_streak.values(), default=0)
+        multiplier = min(self.MAX_INTERVAL_MULTIPLIER, 2 ** (streak // self.UNCHANGED_STREAK_STEP))
+        return base_interval * multiplier
+
+    def _session_is_fresh(self):
+        """Whether the last successful refresh is still within its usable lifetime"""
+        return self._last_refresh is not None and time.monotonic() - self._last_refresh < self._session_ttl
+
+    def _session_lifetime(self):
+        """Seconds a fresh session can be reused: REFRESH_TTL, cut short by the earliest cookie expiry"""
+        expiries = [cookie.expires for cookie in self.session.cookies if cookie.expires]
+        if not expiries:
+            # Browser-session cookies carry no expiry, so fall back to the fixed TTL
+            return self.REFRESH_TTL
+        remaining = min(expiries) - time.time() - self.COOKIE_EXPIRY_MARGIN
+        return max(0, min(self.REFRESH_TTL, remaining))
+
+    def _refresh_expired_session(self, generation):
+        """Refresh after a 403 unless another worker already did so since `generation` was read"""
+        with self._refresh_lock:
+            if self._session_generation != generation:
+                self.logger.debug("Session already refreshed by another worker")
+                return True
+            # The cached session is no longer trusted; it stays invalid if the refresh fails
+            self._last_refresh = None
+            return self._refresh_session()
+
+    def _decode_slots(self, response, location_id):
+        """Decode a slots response body, refusing oversized bodies before they are downloaded"""
+        content_length = int(response.headers.get('Content-Length') or 0)
+        if content_length > self.MAX_RESPONSE_BYTES:
+            self.logger.warning(f"Skipping oversized response for location {location_id}: {content_length} bytes")
+            response.close()
+            return None
+
+        # Chunked responses carry no length up front, so enforce the cap while streaming
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body += chunk
+            if len(body) > self.MAX_RESPONSE_BYTES:
+                self.logger.warning(f"Skipping oversized response for location {location_id}: over {self.MAX_RESPONSE_BYTES} bytes")
+                response.close()
+                return None
+
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # orjson only accepts UTF-8; stdlib json also detects UTF-16 and UTF-32 bodies
+            return json.loads(body)
+
+    def _store_validators(self, url, response):
+        """Remember the response's cache validators so the next poll can be a conditional GET"""
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        if validators:
+            self._validators[url] = validators
+        else:
+            # Server doesn't support conditional requests for this URL
+            self._validators.pop(url, None)
 
     def _refresh_session(self):
         """Refresh the session by visiting the main scheduling page"""
         try:
             self.logger.info("Refreshing session...")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
-
             response = self.session.get(
                 'https://ttp.cbp.dhs.gov/schedulerui/schedule-interview/location',
                 params={
@@ -152,13 +513,16 @@ class GlobalEntrySlotChecker:
                     'returnUrl': 'ttpui/home',
                     'service': 'up'
                 },
-                headers=headers,
+                headers=self._REFRESH_HEADERS,
                 timeout=30
             )
 
             if response.status_code == 200:
+                self._session_generation += 1
+                self._session_ttl = self._session_lifetime()
+                self._last_refresh = time.monotonic()
                 self.logger.info("Session refreshed successfully")
-                self.logger.debug(f"New cookies: {dict(self.session.cookies)}")
+                self.logger.debug("New cookies: %s", self.session.cookies)
                 return True
             else:
                 self.logger.warning(f"Failed to refresh session. Status code: {response.status_code}")
@@ -170,29 +534,27 @@ class GlobalEntrySlotChecker:
 
     def _make_request(self, url):
         """Make HTTP request to the scheduler API with proper headers"""
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Referer': 'https://ttp.cbp.dhs.gov/schedulerui/schedule-interview/location?lang=en&vo=true&returnUrl=ttpui/home&service=up',
-            'Origin': 'https://ttp.cbp.dhs.gov',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
-
         try:
-            self.logger.debug(f"Making request to URL: {url}")
-            self.logger.debug(f"Current cookies: {dict(self.session.cookies)}")
-
-            response = self.session.get(url, headers=headers, timeout=30)
-
-            self.logger.debug(f"Response status code: {response.status_code}")
-            self.logger.debug(f"Response cookies: {dict(response.cookies)}")
-
+            # Containers are passed as-is: logging only renders them if the record is emitted
+            self.logger.debug("Making request to URL: %s", url)
+            self.logger.debug("Current cookies: %s", self.session.cookies)
+
+            headers = self._API_HEADERS
+            validators = self._validators.get(url)
+            if validators:
+                headers = {**headers, **validators}
+
+            self._rate_limiter.acquire()
+            # Stream so the body is only downloaded once the size guard in _decode_slots allows it
+            response = self.session.get(url, headers=headers, timeout=30, stream=True)
             if response.status_code != 200:
-                self.logger.debug(f"Response content: {response.text[:500]}")
+                # Error and 304 bodies are small; read them now so the connection goes back to the pool
+                response.content
+
+            self.logger.debug("Response status code: %s", response.status_code)
+            self.logger.debug("Response cookies: %s", response.cookies)
+            if response.status_code not in (200, 304) and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Response content: %s", response.text[:500])
 
             return response
 
@@ -202,7 +564,7 @@ class GlobalEntrySlotChecker:
 
     def _handle_error_response(self, response, location_id):
         """Handle various error responses from the API"""
-        if not response:
+        if response is None:
             self.logger.error(f"No response received for location {location_id}")
             return
 
@@ -213,93 +575,76 @@ class GlobalEntrySlotChecker:
             error_msg = f"Unexpected response for location {location_id}"
 
         self.logger.warning(error_msg)
-        self.logger.debug(f"Response status: {response.status_code}")
-        self.logger.debug(f"Response headers: {dict(response.headers)}")
-        self.logger.debug(f"Response content: {response.text}")
+        self.logger.debug("Response status: %s", response.status_code)
+        self.logger.debug("Response headers: %s", response.headers)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Response content: %s", response.text)
 
     def _process_slots(self, slots, location_id):
-        """Process and format available slots, returning only the earliest date"""
+        """Process and format available slots, returning only the earliest date within the date window"""
         processed_slots = []
-        slots_by_date = {}
-        location_names = {
-            '5140': 'JFK International Airport',
-            '14321': 'Charlotte-Douglas International Airport',
-            '5142': 'Boston Logan Airport',
-            '5182': 'Daniel K. Inouye International Airport',
-            '5002': 'Los Angeles International Airport',
-            '5446': 'San Francisco International Airport',
-            '5177': 'Seattle-Tacoma International Airport',
-            '5013': 'Miami International Airport',
-            '5300': 'Minneapolis Saint Paul Airport',
-            '5447': 'Philadelphia International Airport',
-            '5027': 'Detroit International Airport',
-            '5499': 'Champlain-Highgate',
-            '5161': 'Alcan',
-            '13321': 'Chicago O\'Hare'
-        }
-        location_name = location_names.get(location_id, f'Location {location_id}')
+        earliest_date = None
+        times = []
+        location_name = self.location_name(location_id)
 
-        self.logger.info(f"Processing slots for {location_name}")
+        self.logger.info("Processing slots for %s", location_name)
 
-        # Group slots by date
+        # Slots arrive soonest first (orderBy=soonest), so collect the first date's times and
+        # stop at the first slot on a later date instead of parsing the rest of the response
+        # Work on the JSON dicts directly; only the display date and time are needed here
         for slot_data in slots:
             try:
-                appointment = Appointment(
-                    location_id=location_id,
-                    start_timestamp=slot_data['startTimestamp'],
-                    end_timestamp=slot_data.get('endTimestamp', ''),
-                    duration=slot_data.get('duration', 15)
-                )
+                start_timestamp = slot_data['startTimestamp']
+                slot_instant = start_timestamp[:16]
+                if slot_instant < self._start_key:
+                    continue
+                if slot_instant >= self._end_key:
+                    # Every remaining slot is later still
+                    break
+
+                slot_date, slot_time = _format_slot(start_timestamp)
 
-                # Group slots by date
-                if appointment.date not in slots_by_date:
-                    slots_by_date[appointment.date] = []
-                slots_by_date[appointment.date].append(appointment.time)
+                if earliest_date is None:
+                    earliest_date = slot_date
+                elif slot_date != earliest_date:
+                    break
+                times.append(slot_time)
 
-                self.logger.debug(f"Added slot for {location_name} on {appointment.date} at {appointment.time}")
+                self.logger.debug("Added slot for %s on %s at %s", location_name, slot_date, slot_time)
 
             except Exception as e:
                 self.logger.error(f"Error processing slot {slot_data}: {str(e)}")
 
-        if slots_by_date:
-            # Get the earliest date
-            earliest_date = min(slots_by_date.keys())
-            times = sorted(slots_by_date[earliest_date])  # Sort times chronologically
-
+        if times:
             slot_info = {
                 'location': location_id,
                 'date': earliest_date,
                 'times': times,
                 'location_name': location_name
             }
-            self.logger.info(f"Found {len(times)} slots at {location_name} on {earliest_date}: {', '.join(times)}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Found %d slots at %s on %s: %s", len(times), location_name, earliest_date, ', '.join(times))
             processed_slots.append(slot_info)
         else:
-            self.logger.info(f"No available slots found at {location_name}")
+            self.logger.info("No available slots found at %s", location_name)
 
         return processed_slots
 
     def get_test_slot(self):
         """Generate a test slot for verification purposes"""
         location_id = self.location_ids[0]
-        location_names = {
-            '5140': 'JFK International Airport',
-            '14321': 'Charlotte-Douglas International Airport',
-            '5182': 'Daniel K. Inouye International Airport',
-            # Add more locations as needed
-        }
-        location_name = location_names.get(location_id, f'Location {location_id}')
+        location_name = self.location_name(location_id)
 
         # Get current time in EST
-        est_tz = pytz.timezone('America/New_York')
-        current_time = datetime.now(est_tz)
+        current_time = datetime.now(_EST_TZ)
+        timestamp = current_time.strftime('%Y-%m-%dT%H:%M')
 
         test_slot = {
             'location': location_id,
             'location_name': location_name,
-            'date': current_time.strftime('%Y-%m-%d'),
+            'date': timestamp[:10],
             'time': current_time.strftime('%I:%M %p EST'),  # 12-hour format with AM/PM and EST indicator
-            'timestamp': current_time.strftime('%Y-%m-%dT%H:%M')
+            'timestamp': timestamp
         }
         self.logger.info(f"Generated test slot: {test_slot}")
         return [test_slot]
\ No newline at end of file
@@ -1,7 +1,13 @@
 import unittest
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 import json
+import threading
+import time
+import requests
+import responses
 from datetime import datetime
+import slot_checker
 from slot_checker import GlobalEntrySlotChecker, Appointment
 
 class MockResponse:
@@ -14,10 +20,24 @@ class MockResponse:
             'x-content-type-options': 'nosniff',
             'content-type': 'application/json'
         }
-        self.text = json.dumps(json_data) if json_data else ""
+        self._json_bytes = json.dumps(json_data).encode()
+        self.content = self._json_bytes
+
+    @property
+    def text(self):
+        # Only error paths read the text; decode the body on demand instead of serializing twice
+        return self._json_bytes.decode() if self._json_data else ""
 
     def json(self):
-        return self._json_data
+        # Parse the body like requests does, so decoding bugs surface in tests
+        return json.loads(self._json_bytes)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self._json_bytes), chunk_size):
+            yield self._json_bytes[start:start + chunk_size]
+
+    def close(self):
+        pass
 
 class TestGlobalEntrySlotChecker(unittest.TestCase):
     def setUp(self):
@@ -107,6 +127,504 @@ class TestGlobalEntrySlotChecker(unittest.TestCase):
         slots = self.checker.check_slots()
         self.assertEqual(len(slots), 0)
 
+    @patch('requests.Session')
+    def test_expired_session_with_renewed_cookie_skips_refresh(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        error_response = MockResponse(403, None, headers={'Set-Cookie': 'TS01ddc3cd=renewed-cookie'})
+        retry_response = MockResponse(200, [])
+
+        session_instance.get.side_effect = [refresh_response, error_response, retry_response]
+
+        self.assertEqual(self.checker.check_slots(), [])
+
+        # The retry goes straight back to the slots API instead of the scheduling page
+        self.assertEqual(session_instance.get.call_count, 3)
+        self.assertIn('locationId=', session_instance.get.call_args_list[2].args[0])
+
+    @patch('requests.Session')
+    def test_rejected_renewed_cookie_falls_back_to_refresh(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        # Load balancers set cookies on every response, so both 403s carry Set-Cookie
+        renewed = {'Set-Cookie': 'TS01ddc3cd=renewed-cookie'}
+        session_instance.get.side_effect = [
+            MockResponse(200, None, {'session_cookie': 'test-cookie'}),
+            MockResponse(403, None, headers=renewed),
+            MockResponse(403, None, headers=renewed),
+            MockResponse(200, None),  # Full refresh
+            MockResponse(200, [{
+                'locationId': '14321',
+                'startTimestamp': '2025-02-14T15:00',
+                'endTimestamp': '2025-02-14T15:15',
+                'duration': 15
+            }])
+        ]
+
+        slots = self.checker.check_slots()
+
+        self.assertEqual(slots[0]['times'], ['10:00 AM EST'])
+        self.assertEqual(session_instance.get.call_count, 5)
+        self.assertNotIn('locationId=', session_instance.get.call_args_list[3].args[0])
+
+    @patch('requests.Session')
+    def test_session_refresh_reused_within_ttl(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        session_instance.get.side_effect = [
+            refresh_response,       # First cycle refreshes the session
+            MockResponse(200, []),  # First cycle slots
+            MockResponse(200, [])   # Second cycle goes straight to the slots API
+        ]
+
+        self.checker.check_slots()
+        self.checker.check_slots()
+        self.assertEqual(session_instance.get.call_count, 3)
+
+    @patch('requests.Session')
+    def test_cookie_reuse_skips_refresh(self, mock_session):
+        session_instance = mock_session.return_value
+        session_instance.cookies = requests.cookies.RequestsCookieJar()
+        session_instance.cookies.set('TS01ddc3cd', 'test-cookie', expires=int(time.time()) + 3600)
+        self.checker.session = session_instance
+
+        session_instance.get.side_effect = [
+            MockResponse(200, None),  # Refresh
+            MockResponse(200, []),
+            MockResponse(200, [])
+        ]
+
+        self.checker.check_slots()
+        session_instance.get.reset_mock()
+        self.checker.check_slots()
+
+        # The cookie is still valid, so only the slots API is called
+        self.assertEqual(session_instance.get.call_count, 1)
+        self.assertIn('locationId=', session_instance.get.call_args.args[0])
+
+    @patch('requests.Session')
+    def test_expiring_cookie_forces_refresh(self, mock_session):
+        session_instance = mock_session.return_value
+        session_instance.cookies = requests.cookies.RequestsCookieJar()
+        # Expires inside COOKIE_EXPIRY_MARGIN, so the next cycle must refresh again
+        session_instance.cookies.set('TS01ddc3cd', 'test-cookie', expires=int(time.time()) + 10)
+        self.checker.session = session_instance
+
+        session_instance.get.side_effect = [
+            MockResponse(200, None), MockResponse(200, []),
+            MockResponse(200, None), MockResponse(200, [])
+        ]
+
+        self.checker.check_slots()
+        self.checker.check_slots()
+        self.assertEqual(session_instance.get.call_count, 4)
+        self.assertNotIn('locationId=', session_instance.get.call_args_list[2].args[0])
+
+    @patch('requests.Session')
+    def test_conditional_request_not_modified(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        slots_response = MockResponse(
+            200,
+            [{
+                'locationId': '14321',
+                'startTimestamp': '2025-02-14T15:00',
+                'endTimestamp': '2025-02-14T15:15',
+                'duration': 15
+            }],
+            headers={'content-type': 'application/json', 'ETag': '"abc123"'}
+        )
+        not_modified_response = MockResponse(304, None)
+
+        session_instance.get.side_effect = [refresh_response, slots_response, not_modified_response]
+
+        self.assertEqual(len(self.checker.check_slots()), 1)
+        self.assertEqual(self.checker.check_slots(), [])
+
+        # The second poll revalidates with the ETag from the first
+        second_poll_headers = session_instance.get.call_args_list[2].kwargs['headers']
+        self.assertEqual(second_poll_headers['If-None-Match'], '"abc123"')
+        self.assertNotIn('If-None-Match', self.checker._API_HEADERS)
+
+    @patch('requests.Session')
+    def test_oversized_response_skipped(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        oversized_response = MockResponse(
+            200,
+            [{'locationId': '14321', 'startTimestamp': '2025-02-14T15:00'}],
+            headers={'Content-Length': str(self.checker.MAX_RESPONSE_BYTES + 1)}
+        )
+        session_instance.get.side_effect = [refresh_response, oversized_response]
+
+        self.assertEqual(self.checker.check_slots(), [])
+
+    @patch('requests.Session')
+    def test_oversized_streamed_response_skipped(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+        self.checker.MAX_RESPONSE_BYTES = 100
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        # No Content-Length, as with a chunked response, so the cap applies while streaming
+        streamed_response = MockResponse(
+            200,
+            [{'locationId': '14321', 'startTimestamp': '2025-02-14T15:00'}] * 10
+        )
+        session_instance.get.side_effect = [refresh_response, streamed_response]
+
+        self.assertEqual(self.checker.check_slots(), [])
+
+    @patch('requests.Session')
+    def test_poll_interval_stretches_while_unchanged(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        steps = self.checker.UNCHANGED_STREAK_STEP
+        session_instance.get.side_effect = [refresh_response] + [MockResponse(200, []) for _ in range(steps)]
+
+        self.assertEqual(self.checker.next_poll_interval(300), 300)
+        for _ in range(steps):
+            self.checker.check_slots()
+        self.assertEqual(self.checker.next_poll_interval(300), 600)
+        # Every unchanged poll reached the API
+        self.assertEqual(session_instance.get.call_count, 1 + steps)
+
+    @patch('requests.Session')
+    def test_cache_hit_skips_http(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+        self.checker.cache_ttl_seconds = 30
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        slots_response = MockResponse(200, [{
+            'locationId': '14321',
+            'startTimestamp': '2025-02-14T15:00',
+            'endTimestamp': '2025-02-14T15:15',
+            'duration': 15
+        }])
+        session_instance.get.side_effect = [refresh_response, slots_response]
+
+        self.assertEqual(len(self.checker.check_slots()), 1)
+        # Served from the cache: no new HTTP call, and the unchanged slots aren't reported twice
+        self.assertEqual(self.checker.check_slots(), [])
+        self.assertEqual(session_instance.get.call_count, 2)
+
+    @patch('requests.Session')
+    def test_params_precomputed(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        slots_url = self.checker._urls['14321']
+        self.assertEqual(slots_url, f"{self.checker.BASE_URL}?orderBy=soonest&locationId=14321&minimum=1")
+
+        session_instance.get.side_effect = [MockResponse(200, None), MockResponse(200, [])]
+        self.checker.check_slots()
+
+        # The request reuses the prebuilt URL rather than formatting a new one
+        self.assertIs(session_instance.get.call_args.args[0], slots_url)
+        self.assertNotIn('params', session_instance.get.call_args.kwargs)
+
+    @patch('requests.Session')
+    def test_no_locations(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(location_ids=[], date_start=self.date_start, date_end=self.date_end)
+        self.checker.session = session_instance
+        session_instance.get.return_value = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+
+        self.assertEqual(self.checker.check_slots(), [])
+
+    @patch('requests.Session')
+    def test_multiple_locations(self, mock_session):
+        # Setup mock session
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end
+        )
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+
+        def fake_get(url, **kwargs):
+            # Locations are polled concurrently, so answer by URL rather than call order
+            if 'locationId=' not in url:
+                return refresh_response
+            location_id = url.split('locationId=')[1].split('&')[0]
+            return MockResponse(200, [{
+                'locationId': location_id,
+                'startTimestamp': '2025-02-14T15:00',
+                'endTimestamp': '2025-02-14T15:15',
+                'duration': 15
+            }])
+
+        session_instance.get.side_effect = fake_get
+
+        slots = self.checker.check_slots()
+
+        # Results keep the configured location order
+        self.assertEqual([slot['location'] for slot in slots], ['14321', '5140'])
+        self.assertEqual(session_instance.get.call_count, 3)
+
+    @patch('requests.Session')
+    def test_throttled_locations_back_off_once_per_cycle(self, mock_session):
+        session_instance = mock_session.return_value
+        location_ids = [str(location_id) for location_id in range(5000, 5008)]
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=location_ids,
+            date_start=self.date_start,
+            date_end=self.date_end
+        )
+        self.checker.session = session_instance
+        self.checker._rate_limiter.acquire = Mock()
+
+        def fake_get(url, **kwargs):
+            if 'locationId=' not in url:
+                return MockResponse(200, None, {'session_cookie': 'test-cookie'})
+            return MockResponse(429, None)
+
+        session_instance.get.side_effect = fake_get
+
+        with patch('slot_checker.time.sleep') as sleep:
+            self.assertEqual(self.checker.check_slots(), [])
+
+        # Every location was throttled, but the backoff doubled once and the cycle paused once
+        self.assertEqual(self.checker._backoff, 4.0)
+        sleep.assert_called_once_with(4.0)
+
+    @patch('requests.Session')
+    def test_concurrent_session_expiry_refreshes_once(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end
+        )
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        both_sent = threading.Barrier(2, timeout=5)
+        expired = set()
+
+        def fake_get(url, **kwargs):
+            if 'locationId=' not in url:
+                return refresh_response
+            location_id = url.split('locationId=')[1].split('&')[0]
+            if location_id not in expired:
+                # Hold both workers until each has been rejected under the same session
+                expired.add(location_id)
+                both_sent.wait()
+                return MockResponse(403, None)
+            return MockResponse(200, [])
+
+        session_instance.get.side_effect = fake_get
+
+        self.checker.check_slots()
+
+        refresh_calls = [c for c in session_instance.get.call_args_list if 'locationId=' not in c.args[0]]
+        # One refresh at the start of the cycle plus exactly one after the concurrent 403s
+        self.assertEqual(len(refresh_calls), 2)
+
+    @patch('requests.Session')
+    def test_batched_locations(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end,
+            batch_locations=True
+        )
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        batch_response = MockResponse(200, [
+            {'locationId': 5140, 'startTimestamp': '2025-02-14T15:00'},
+            {'locationId': 14321, 'startTimestamp': '2025-02-15T15:00'}
+        ])
+        session_instance.get.side_effect = [refresh_response, batch_response]
+
+        slots = self.checker.check_slots()
+
+        self.assertEqual([slot['location'] for slot in slots], ['14321', '5140'])
+        self.assertEqual(session_instance.get.call_count, 2)
+        batch_url = session_instance.get.call_args_list[1].args[0]
+        self.assertIn('locationId=14321&locationId=5140', batch_url)
+
+    @patch('requests.Session')
+    def test_batched_locations_fallback(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end,
+            batch_locations=True
+        )
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        # A response whose slots can't be attributed to a location means batching isn't supported
+        batch_response = MockResponse(200, [{'startTimestamp': '2025-02-14T15:00'}])
+
+        def fake_get(url, **kwargs):
+            if 'locationId=' not in url:
+                return refresh_response
+            if url.count('locationId=') > 1:
+                return batch_response
+            location_id = url.split('locationId=')[1].split('&')[0]
+            return MockResponse(200, [{'locationId': location_id, 'startTimestamp': '2025-02-14T15:00'}])
+
+        session_instance.get.side_effect = fake_get
+
+        slots = self.checker.check_slots()
+
+        self.assertEqual([slot['location'] for slot in slots], ['14321', '5140'])
+        self.assertEqual(session_instance.get.call_count, 4)
+
+    @patch('requests.Session')
+    def test_throttled_batch_skips_fallback(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end,
+            batch_locations=True
+        )
+        self.checker.session = session_instance
+
+        session_instance.get.side_effect = [
+            MockResponse(200, None, {'session_cookie': 'test-cookie'}),
+            MockResponse(429, None)
+        ]
+
+        with patch('slot_checker.time.sleep'):
+            self.assertEqual(self.checker.check_slots(), [])
+
+        # Being throttled says nothing about batching support, so no per-location requests follow
+        self.assertEqual(session_instance.get.call_count, 2)
+
+    @patch('requests.Session')
+    def test_blocked_batch_skips_fallback(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321', '5140'],
+            date_start=self.date_start,
+            date_end=self.date_end,
+            batch_locations=True
+        )
+        self.checker.session = session_instance
+
+        session_instance.get.side_effect = [
+            MockResponse(200, None, {'session_cookie': 'test-cookie'}),
+            MockResponse(403, None),
+            MockResponse(200, None),  # Refresh succeeds...
+            MockResponse(403, None)   # ...but the batch is still refused
+        ]
+
+        self.assertEqual(self.checker.check_slots(), [])
+
+        # A persistent 403 is a block, not a sign batching is unsupported; no per-location requests follow
+        self.assertEqual(session_instance.get.call_count, 4)
+
+    @responses.activate
+    def test_real_session_round_trip(self):
+        # Mock at the transport level so the real session's adapter and headers are exercised
+        self.checker.session = slot_checker._build_session()
+        responses.add(responses.GET, 'https://ttp.cbp.dhs.gov/schedulerui/schedule-interview/location', status=200)
+        responses.add(responses.GET, self.checker.BASE_URL, status=200, json=[{
+            'locationId': 14321,
+            'startTimestamp': '2025-02-14T15:00',
+            'endTimestamp': '2025-02-14T15:15',
+            'duration': 15
+        }])
+
+        slots = self.checker.check_slots()
+
+        self.assertEqual(slots[0]['times'], ['10:00 AM EST'])
+        self.assertEqual(len(responses.calls), 2)
+        slots_request = responses.calls[1].request
+        self.assertIn('locationId=14321', slots_request.url)
+        self.assertEqual(slots_request.headers['Connection'], 'keep-alive')
+        self.assertEqual(slots_request.headers['Accept'], self.checker._API_HEADERS['Accept'])
+
+    def test_session_pool_and_default_headers(self):
+        adapter = self.checker.session.get_adapter('https://ttp.cbp.dhs.gov')
+        self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], slot_checker._POOL_MAXSIZE)
+        self.assertEqual(self.checker.session.headers['Connection'], 'keep-alive')
+        self.assertNotIn('br', self.checker.session.headers['Accept-Encoding'])
+
+    def test_slots_changed_only_reports_new_slots(self):
+        first = [{'date': '2025-02-14', 'times': ['09:00 AM EST']}]
+        same = [{'date': '2025-02-14', 'times': ['09:00 AM EST']}]
+        more = [{'date': '2025-02-14', 'times': ['09:00 AM EST', '10:30 AM EST']}]
+
+        self.assertTrue(self.checker._slots_changed('14321', first))
+        self.assertFalse(self.checker._slots_changed('14321', same))
+        self.assertTrue(self.checker._slots_changed('14321', more))
+        self.assertIsInstance(self.checker.last_seen_slots['14321'], int)
+
+    def test_process_slots_keeps_only_earliest_date(self):
+        slots = [
+            {'startTimestamp': '2025-02-14T14:00'},
+            {'startTimestamp': '2025-02-14T15:30'},
+            {'startTimestamp': '2025-02-15T14:00'},
+            {'startTimestamp': 'not-a-timestamp'}  # never reached: parsing stops at the later date
+        ]
+
+        with patch.object(self.checker.logger, 'error') as log_error:
+            processed = self.checker._process_slots(slots, '14321')
+
+        self.assertEqual(len(processed), 1)
+        self.assertEqual(processed[0]['date'], '2025-02-14')
+        self.assertEqual(processed[0]['times'], ['09:00 AM EST', '10:30 AM EST'])
+        log_error.assert_not_called()
+
+    def test_process_slots_skips_dates_outside_window(self):
+        slots = [
+            {'locationId': '14321', 'startTimestamp': '2025-02-13T15:00'},  # before date_start
+            {'locationId': '14321', 'startTimestamp': '2025-06-01T15:00'},
+            {'locationId': '14321', 'startTimestamp': '2026-03-01T15:00'}   # after date_end
+        ]
+
+        with patch('slot_checker._format_slot', wraps=slot_checker._format_slot) as format_slot:
+            processed = self.checker._process_slots(slots, '14321')
+
+        self.assertEqual(processed[0]['date'], '2025-06-01')
+        self.assertEqual(processed[0]['times'], ['11:00 AM EST'])
+        # Out-of-window slots are rejected without being parsed
+        format_slot.assert_called_once_with('2025-06-01T15:00')
+
+        # The window is in Eastern dates, so evening slots on the next UTC date still count
+        checker = GlobalEntrySlotChecker(location_ids=['14321'], date_start='2025-02-14', date_end='2025-02-20')
+        before_start = {'startTimestamp': '2025-02-14T02:00'}  # 09:00 PM EST on 2025-02-13
+        last_evening = {'startTimestamp': '2025-02-21T03:00'}  # 10:00 PM EST on 2025-02-20
+        after_end = {'startTimestamp': '2025-02-21T05:00'}     # 12:00 AM EST on 2025-02-21
+
+        processed = checker._process_slots([before_start, last_evening, after_end], '14321')
+        self.assertEqual(processed[0]['date'], '2025-02-20')
+        self.assertEqual(processed[0]['times'], ['10:00 PM EST'])
+        self.assertEqual(checker._process_slots([before_start, after_end], '14321'), [])
+
+    def test_appointment_is_slotted(self):
+        appointment = Appointment(
+            location_id='14321',
+            start_timestamp='2025-02-14T10:00',
+            end_timestamp='2025-02-14T10:15'
+        )
+
+        # Appointments are slotted records; no per-instance __dict__
+        self.assertFalse(hasattr(appointment, '__dict__'))
+
     def test_appointment_class(self):
         # Test Appointment class functionality
         appointment = Appointment(
@@ -120,5 +638,45 @@ class TestGlobalEntrySlotChecker(unittest.TestCase):
         self.assertEqual(appointment.time, '10:00')
         self.assertEqual(appointment.duration, 15)
 
+class TestGlobalEntrySlotCheckerAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.checker = GlobalEntrySlotChecker(
+            location_ids=['14321'],
+            date_start='2025-02-14',
+            date_end='2026-02-14'
+        )
+
+    @patch('requests.Session')
+    async def test_check_slots_async(self, mock_session):
+        session_instance = mock_session.return_value
+        self.checker.session = session_instance
+
+        refresh_response = MockResponse(200, None, {'session_cookie': 'test-cookie'})
+        slots_response = MockResponse(200, [{
+            'locationId': '14321',
+            'startTimestamp': '2025-02-14T15:00',
+            'endTimestamp': '2025-02-14T15:15',
+            'duration': 15
+        }])
+        session_instance.get.side_effect = [refresh_response, slots_response]
+
+        slots = await self.checker.check_slots_async()
+
+        self.assertEqual(len(slots), 1)
+        self.assertEqual(slots[0]['times'], ['10:00 AM EST'])
+
+    async def test_run_forever_polls_with_jitter(self):
+        found = [{'location': '14321', 'date': '2025-02-14', 'times': ['10:00 AM EST']}]
+        on_check = AsyncMock()
+
+        with patch.object(self.checker, 'check_slots_async', AsyncMock(side_effect=[[], found])), \
+                patch('slot_checker.asyncio.sleep', AsyncMock(side_effect=[None, asyncio.CancelledError()])) as sleep:
+            with self.assertRaises(asyncio.CancelledError):
+                await self.checker.run_forever(60, on_check)
+
+        self.assertEqual(on_check.await_args_list[1].args, (found, 60))
+        for call in sleep.await_args_list:
+            self.assertTrue(60 <= call.args[0] <= 60 + self.checker.POLL_JITTER)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
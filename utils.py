@@ -1,13 +1,48 @@
 import logging
+import os
+import threading
+import time
 
 def setup_logging():
-    """Configure logging settings"""
+    """Configure logging settings; the level comes from LOG_LEVEL (default INFO)"""
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
     logging.basicConfig(
-        level=logging.DEBUG,  # Changed from INFO to DEBUG for more detailed logs
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
+        level=level,
+        format='{asctime} - {name} - {levelname} - {message}',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        style='{'
     )
 
+    # Records never show thread or process info, so skip looking it up for each one
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Reduce noise from external libraries while keeping our debug logs
     logging.getLogger('urllib3').setLevel(logging.WARNING)
-    logging.getLogger('requests').setLevel(logging.WARNING)
\ No newline at end of file
+    logging.getLogger('requests').setLevel(logging.WARNING)
+
+class TokenBucket:
+    """Thread-safe token bucket: allows bursts of up to max_rate calls, refilled at max_rate per time_period seconds"""
+    def __init__(self, max_rate, time_period):
+        self.max_rate = max_rate
+        self.fill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_fill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.max_rate, self._tokens + (now - self._last_fill) * self.fill_rate)
+                self._last_fill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.fill_rate
+            time.sleep(wait)
\ No newline at end of file